@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+
+# Load generator and end-to-end latency harness for the marquee server
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import tempfile
+import threading
+import logging
+import contextlib
+import http.client
+from datetime import datetime
+
+TRANSPORTS = ('unix', 'tcp', 'web')
+E2E_IDLE_GRACE = 3.0  # Seconds the e2e server must stay idle before missing messages count as lost
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description='Marquee load generator and latency harness')
+    parser.add_argument('mode', choices=['load', 'e2e'],
+                      help='load: flood a running server, e2e: run a headless server in-process '
+                           'and measure ingest-to-enqueue and enqueue-to-display latency')
+    parser.add_argument('-T', '--transports', default='unix',
+                      help='Comma separated transports to flood: unix, tcp, web (default: unix)')
+    parser.add_argument('-r', '--rate', type=float, default=5.0,
+                      help='Messages per second per transport (default: 5)')
+    parser.add_argument('-D', '--duration', type=float, default=10.0,
+                      help='Seconds to generate load for (default: 10)')
+    parser.add_argument('-n', '--workers', type=int, default=1,
+                      help='Concurrent senders per transport (default: 1)')
+    parser.add_argument('-s', '--size', type=int, default=32,
+                      help='Message text length in characters (default: 32)')
+    parser.add_argument('-p', '--priorities', default='1:1',
+                      help='Priority mix as PRIORITY:WEIGHT pairs, e.g. 1:1,5:4 (default: 1:1)')
+    parser.add_argument('--speed', type=float, default=0.0,
+                      help='Scroll speed sent with each message (default: 0, as fast as possible)')
+    parser.add_argument('--socket-path', default='/mnt/ram/message_socket',
+                      help='Unix socket path for load mode (default: /mnt/ram/message_socket)')
+    parser.add_argument('--host', default='127.0.0.1',
+                      help='Server host for tcp and web in load mode (default: 127.0.0.1)')
+    parser.add_argument('--tcp-port', type=int, default=5555,
+                      help='TCP port for load mode (default: 5555)')
+    parser.add_argument('--webui-port', type=int, default=5501,
+                      help='Web UI port for load mode (default: 5501)')
+    parser.add_argument('--webui-server', choices=['flask', 'waitress'], default='flask',
+                      help='Web UI server used by the e2e harness (default: flask)')
+    parser.add_argument('--drain-timeout', type=float, default=60.0,
+                      help='Seconds the e2e harness waits for queued messages to display (default: 60)')
+    parser.add_argument('-o', '--output',
+                      help='Write the JSON report to this file')
+    parser.add_argument('-c', '--compare',
+                      help='Compare against a previous JSON report')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                      help='Show server output in e2e mode')
+    return parser.parse_args()
+
+def parse_priorities(spec):
+    """Parse "1:1,5:4" into ([1, 5], [1.0, 4.0])"""
+    priorities, weights = [], []
+    for pair in spec.split(','):
+        priority, _, weight = pair.partition(':')
+        priorities.append(int(priority))
+        weights.append(float(weight or 1))
+    return priorities, weights
+
+def percentiles(values):
+    """Summarize a list of millisecond values"""
+    if not values:
+        return {'count': 0}
+    values = sorted(values)
+
+    def pick(fraction):
+        return round(values[min(len(values) - 1, int(fraction * len(values)))], 3)
+
+    return {
+        'count': len(values),
+        'avg': round(sum(values) / len(values), 3),
+        'p50': pick(0.50),
+        'p95': pick(0.95),
+        'p99': pick(0.99),
+        'max': round(values[-1], 3)
+    }
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class Sender:
+    """Sends messages over one transport, reusing its connection where the transport allows"""
+
+    def __init__(self, transport, args):
+        self.transport = transport
+        self.args = args
+        self.http = None
+
+    def send(self, text, priority):
+        if self.transport == 'web':
+            self._send_web(text, priority)
+            return
+
+        data = f"{priority}|0|{text}|#ffffff|#000000|{self.args.speed}||".encode()
+        if self.transport == 'unix':
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = self.args.socket_path
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            address = (self.args.host, self.args.tcp_port)
+        try:
+            sock.settimeout(5.0)
+            sock.connect(address)
+            sock.sendall(data)
+        finally:
+            sock.close()
+
+    def _send_web(self, text, priority):
+        body = json.dumps({
+            'text': text,
+            'priority': priority,
+            'blinkMode': 0,
+            'color': '#ffffff',
+            'bgColor': '#000000',
+            'speed': self.args.speed
+        })
+        headers = {'Content-Type': 'application/json'}
+        for attempt in range(2):
+            if self.http is None:
+                self.http = http.client.HTTPConnection(self.args.host, self.args.webui_port, timeout=5.0)
+            try:
+                self.http.request('POST', '/api/send-message', body, headers)
+                response = self.http.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"HTTP {response.status}")
+                if response.getheader('Connection', '').lower() == 'close' or response.version < 11:
+                    self.http.close()
+                    self.http = None
+                return
+            except (OSError, http.client.HTTPException):
+                # The server may have closed an idle keep-alive connection, retry once
+                self.http.close()
+                self.http = None
+                if attempt:
+                    raise
+
+def generate_load(args, run_id):
+    """Flood every selected transport at the configured rate, return per-transport results"""
+    priorities, weights = parse_priorities(args.priorities)
+    transports = [t.strip() for t in args.transports.split(',') if t.strip()]
+    for transport in transports:
+        if transport not in TRANSPORTS:
+            raise SystemExit(f"Unknown transport: {transport}")
+
+    results = {
+        transport: {'sent': [], 'errors': 0, 'error_samples': [], 'send_ms': [], 'lock': threading.Lock()}
+        for transport in transports
+    }
+
+    def worker(transport, worker_index):
+        result = results[transport]
+        sender = Sender(transport, args)
+        interval = args.workers / args.rate
+        start = time.time() + worker_index * interval / args.workers  # Stagger the workers
+        seq = 0
+        while True:
+            send_time = start + seq * interval
+            if send_time - start >= args.duration:
+                break
+            delay = send_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            tag = f"lt-{run_id}-{transport}-{worker_index}-{seq} "
+            text = (tag + 'x' * args.size)[:max(args.size, len(tag))]
+            priority = random.choices(priorities, weights)[0]
+            sent_at = time.time()
+            try:
+                sender.send(text, priority)
+                elapsed_ms = (time.time() - sent_at) * 1000
+                with result['lock']:
+                    result['sent'].append((text, sent_at))
+                    result['send_ms'].append(elapsed_ms)
+            except Exception as e:
+                with result['lock']:
+                    result['errors'] += 1
+                    if len(result['error_samples']) < 5:
+                        result['error_samples'].append(str(e))
+            seq += 1
+
+    threads = [
+        threading.Thread(target=worker, args=(transport, index), daemon=True)
+        for transport in transports
+        for index in range(args.workers)
+    ]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Sends are spread over the whole duration, even though the last one starts before its end
+    elapsed = max(time.time() - started, args.duration)
+
+    for result in results.values():
+        result['elapsed'] = elapsed
+        del result['lock']
+    return results
+
+def summarize_load(results):
+    summary = {}
+    for transport, result in results.items():
+        sent = len(result['sent'])
+        summary[transport] = {
+            'sent': sent,
+            'errors': result['errors'],
+            'error_samples': result['error_samples'],
+            'achieved_rate': round(sent / result['elapsed'], 3) if result['elapsed'] else 0,
+            'send_ms': percentiles(result['send_ms'])
+        }
+    return summary
+
+def run_load(args, run_id):
+    return summarize_load(generate_load(args, run_id))
+
+def run_e2e(args, run_id):
+    """Start a headless server in-process, flood it and match displayed messages to sends"""
+    # The server initializes pygame at import, render offscreen and without a sound device
+    os.environ['MARQUEE_HEADLESS'] = '1'
+    import marquee_msg_sys as server
+
+    workdir = tempfile.mkdtemp(prefix='marquee-e2e-')
+    server.sock_path = args.socket_path = os.path.join(workdir, 'message_socket')
+    server.tcp_port = args.tcp_port = free_port()
+    args.webui_port = free_port()
+    args.host = '127.0.0.1'
+
+    server_output = sys.stdout if args.verbose else io.StringIO()
+    if not args.verbose:
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    with contextlib.redirect_stdout(server_output):
+        server.open_ingest_sockets(enable_tcp=True)
+        threading.Thread(target=server.start_socket_listener, daemon=True).start()
+        threading.Thread(target=server.start_webserver,
+                         args=(args.webui_port, None, args.webui_server), daemon=True).start()
+        time.sleep(1.0)  # Let the web server bind
+
+        stop_event = threading.Event()
+        load_results = {}
+
+        def drive():
+            load_results.update(generate_load(args, run_id))
+            sent = {text for result in load_results.values() for text, _ in result['sent']}
+            deadline = time.time() + args.drain_timeout
+            idle_since = None
+            while time.time() < deadline:
+                if sent <= {entry['text'] for entry in list(server.latency_log)}:
+                    break
+                # The queue briefly looks empty while a send is still being ingested or a
+                # window is being created, only give up on a message after a quiet period
+                if server.message_queue.queue.empty() and not server.message_visible:
+                    idle_since = idle_since or time.time()
+                    if time.time() - idle_since >= E2E_IDLE_GRACE:
+                        break
+                else:
+                    idle_since = None
+                time.sleep(0.1)
+            stop_event.set()
+
+        threading.Thread(target=drive, daemon=True).start()
+        server.run_display_loop(stop_event)
+        server.destroy_window()
+
+    displayed = {entry['text']: entry for entry in list(server.latency_log)}
+    summary = summarize_load(load_results)
+    for transport, result in load_results.items():
+        ingest_ms, display_ms = [], []
+        lost = 0
+        for text, _ in result['sent']:
+            entry = displayed.get(text)
+            if entry is None:
+                lost += 1
+                continue
+            if entry['ingest_to_enqueue_ms'] is not None:
+                ingest_ms.append(entry['ingest_to_enqueue_ms'])
+            if entry['enqueue_to_display_ms'] is not None:
+                display_ms.append(entry['enqueue_to_display_ms'])
+        summary[transport].update({
+            'displayed': len(result['sent']) - lost,
+            'lost': lost,
+            'ingest_to_enqueue_ms': percentiles(ingest_ms),
+            'enqueue_to_display_ms': percentiles(display_ms)
+        })
+    return summary
+
+def compare_reports(old, new):
+    """Print the headline metrics of two reports side by side"""
+    metrics = [
+        ('achieved_rate', None),
+        ('errors', None),
+        ('lost', None),
+        ('send_ms', 'p95'),
+        ('ingest_to_enqueue_ms', 'p95'),
+        ('enqueue_to_display_ms', 'p95'),
+    ]
+    print(f"\nComparison against {old.get('timestamp', 'previous report')}:")
+    for transport, new_result in new['transports'].items():
+        old_result = old.get('transports', {}).get(transport)
+        if old_result is None:
+            print(f"  {transport}: not in previous report")
+            continue
+        for metric, field in metrics:
+            old_value, new_value = old_result.get(metric), new_result.get(metric)
+            if field is not None:
+                old_value = (old_value or {}).get(field)
+                new_value = (new_value or {}).get(field)
+            if old_value is None or new_value is None:
+                continue
+            name = f"{metric}.{field}" if field else metric
+            print(f"  {transport:4} {name:26} {old_value:>10} -> {new_value:>10} ({new_value - old_value:+.3f})")
+
+def print_report(report):
+    print(f"\n{report['mode']} report ({report['timestamp']}):")
+    for transport, result in report['transports'].items():
+        line = (f"  {transport:4} sent={result['sent']} errors={result['errors']} "
+                f"rate={result['achieved_rate']}/s send_p95={result['send_ms'].get('p95')}ms")
+        if 'lost' in result:
+            line += (f" lost={result['lost']}"
+                     f" ingest_p95={result['ingest_to_enqueue_ms'].get('p95')}ms"
+                     f" display_p95={result['enqueue_to_display_ms'].get('p95')}ms")
+        print(line)
+        for error in result['error_samples']:
+            print(f"       error: {error}")
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    run_id = f"{int(time.time())}"
+
+    if args.mode == 'e2e':
+        transports = run_e2e(args, run_id)
+    else:
+        transports = run_load(args, run_id)
+
+    report = {
+        'mode': args.mode,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'config': {
+            'transports': args.transports,
+            'rate': args.rate,
+            'duration': args.duration,
+            'workers': args.workers,
+            'size': args.size,
+            'priorities': args.priorities,
+            'speed': args.speed,
+            'webui_server': args.webui_server
+        },
+        'transports': transports
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_reports(json.load(f), report)
@@ -15,17 +15,31 @@ import uuid
 import argparse
 import re
 import json
+import heapq
 import os.path
 import traceback
-from flask import Flask, request, send_from_directory, jsonify
+import cProfile
+import pstats
+import io
+import contextlib
+import gzip
+import hashlib
+import mimetypes
+from flask import Flask, request, send_from_directory, jsonify, g, Response
 import threading
 from functools import partial
 import os
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 from functools import partial
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, fields as dataclass_fields
+from functools import lru_cache
+from collections import deque
 from typing import Optional, Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # Blink masks fall back to per-run fills without NumPy
 
 # Create Flask app
 app = Flask(__name__, static_folder='static')
@@ -33,6 +47,15 @@ app = Flask(__name__, static_folder='static')
 # Global message log
 message_history = []
 ignored_messages = {}  # Dictionary to track ignored messages {message_content: expiry_time}
+static_assets = {}  # Cache of static files {path: StaticAsset}
+static_assets_lock = threading.Lock()
+request_timings = {}  # Per endpoint request timing {endpoint: {'count', 'total_ms', 'max_ms'}}
+request_timings_lock = threading.Lock()
+LATENCY_LOG_SIZE = 10000  # Displayed messages kept in latency_log
+latency_log = deque(maxlen=LATENCY_LOG_SIZE)  # Ingest and display timings of displayed messages
+WEBUI_THREADS = 8  # Worker threads for the waitress web UI server
+webui_display_client = False  # Set when a display client serves only the profiler
+DISPLAY_CLIENT_ENDPOINTS = {'get_profile', 'update_profile'}
 
 
 def parse_arguments():
@@ -40,14 +63,31 @@ def parse_arguments():
     parser.add_argument('-t', '--tcp', action='store_true',
                       help='Enable TCP socket on port 5555 for network messages')
     parser.add_argument('-w', '--webui', action='store_true',
-                      help='Enable Web UI')
+                      help='Enable Web UI (only /api/profile on a display client)')
     parser.add_argument('-wp', '--webui-port', type=int, default=5501,
                       help='Web UI port (default: 5501)')
+    parser.add_argument('-ws', '--webui-server', choices=['flask', 'waitress'], default='flask',
+                      help='Web UI server: Flask development server or threaded waitress '
+                           'production server (default: flask)')
+    parser.add_argument('-H', '--hub', nargs='?', const=f'0.0.0.0:{hub_port}', metavar='ADDRESS',
+                      help=f'Run as a hub broadcasting messages to display clients '
+                           f'(HOST[:PORT] or Unix socket path, default: 0.0.0.0:{hub_port})')
+    parser.add_argument('-d', '--display-client', metavar='ADDRESS',
+                      help='Run as a display-only client of the hub at HOST[:PORT] or Unix socket path')
+    parser.add_argument('-P', '--profile', action='store_true',
+                      help='Start with render loop profiling enabled (can be toggled via /api/profile)')
+    parser.add_argument('-sf', '--schedule-file', default=schedule_path,
+                      help=f'File scheduled messages are persisted to (default: {schedule_path})')
     return parser.parse_args()
 
 # Set display environment variables for pygame
-os.environ['SDL_VIDEODRIVER'] = 'x11'
-os.environ['DISPLAY'] = ':0'
+if os.environ.get('MARQUEE_HEADLESS'):
+    # Render offscreen without a sound device, for test harnesses
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+else:
+    os.environ['SDL_VIDEODRIVER'] = 'x11'
+    os.environ['DISPLAY'] = ':0'
 os.environ['SDL_VIDEO_WINDOW_POS'] = '0,0'
 
 # Initialize Pygame and Pygame Mixer
@@ -57,6 +97,17 @@ pygame.mixer.init()
 # Paths and configurations
 sock_path = "/mnt/ram/message_socket"
 tcp_port = 5555        # For receiving messages
+hub_port = 5556        # For fanning messages out to display clients
+HUB_START_LEAD = 0.5   # Seconds between a hub broadcast and the synchronized start
+HUB_MAX_SCREEN_WIDTH = 3840  # Widest display assumed when estimating scroll time
+HUB_FRAME_OVERHEAD = 0.01    # Seconds of rendering per frame on top of the message speed
+HUB_DONE_MARGIN = 10         # Extra seconds to wait for display clients to finish a message
+HUB_SYNC_SAMPLES = 5   # Clock sync round trips per sync round
+HUB_SYNC_INTERVAL = 60 # Seconds between clock sync rounds
+schedule_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schedules.json")
+MIN_SCHEDULE_INTERVAL = 1.0  # Shortest allowed recurring interval in seconds
+PROFILE_FRAME_LOG_SIZE = 2000  # Frame breakdowns kept while profiling
+PROFILE_MAX_CAPTURE_FRAMES = 10000  # Upper bound for an on-demand cProfile capture
 
 # Font configurations
 FONT_PATHS = [
@@ -74,9 +125,119 @@ EMOJI_FONT_PATHS = [
     None  # Fallback to default font
 ]
 
+MARQUEE_FONT_SIZE = 70
+MARQUEE_TEXT_Y = 10    # Vertical offset of the text inside the window
+
+
+class RenderProfiler:
+    """Opt-in timing of render loop stages.
+
+    While enabled, each frame (and the per message setup before the first
+    frame) records how long its stages took into a ring buffer. Stages nest,
+    e.g. font_load time is also part of the bake stage that triggered it.
+    A cProfile capture of the next N frames can be requested at any time.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.frames = deque(maxlen=PROFILE_FRAME_LOG_SIZE)
+        self.current = None
+        self.frame_open = False
+        self.lock = threading.Lock()
+        self.capture_frames = 0   # Frames still to be captured with cProfile
+        self.capture_profile = None
+        self.capture_report = None
+        self.capture_time = None
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.current is not None:
+                stages = self.current['stages']
+                stages[name] = stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def stage(self, name):
+        """Context manager timing one stage of the current frame"""
+        if not self.enabled or self.current is None:
+            return contextlib.nullcontext()
+        return self._timed_stage(name)
+
+    def start_frame(self, kind, message_id):
+        self.frame_open = True
+        if self.capture_frames and self.capture_profile is None:
+            self.capture_profile = cProfile.Profile()
+            self.capture_profile.enable()
+        if self.enabled:
+            self.current = {
+                'kind': kind,
+                'message_id': message_id,
+                'time': time.time(),
+                'start': time.perf_counter(),
+                'stages': {}
+            }
+
+    def end_frame(self):
+        if not self.frame_open:
+            return
+        self.frame_open = False
+        if self.current is not None:
+            frame = self.current
+            self.current = None
+            frame['total_ms'] = (time.perf_counter() - frame.pop('start')) * 1000
+            self.frames.append(frame)
+
+        if self.capture_profile is not None:
+            self.capture_frames -= 1
+            if self.capture_frames <= 0:
+                self._finish_capture()
+
+    def _finish_capture(self):
+        self.capture_profile.disable()
+        output = io.StringIO()
+        pstats.Stats(self.capture_profile, stream=output).sort_stats('cumulative').print_stats(40)
+        with self.lock:
+            self.capture_report = output.getvalue()
+            self.capture_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.capture_profile = None
+            self.capture_frames = 0
+
+    def request_capture(self, frames):
+        """Profile the next frames rendered with cProfile"""
+        with self.lock:
+            self.capture_frames = max(1, min(int(frames), PROFILE_MAX_CAPTURE_FRAMES))
+
+    def summary(self):
+        """Average and max time per stage over the frames in the ring buffer"""
+        stages = {}
+        frames = [frame for frame in list(self.frames) if frame['kind'] == 'frame']
+        for frame in frames:
+            for name, elapsed_ms in list(frame['stages'].items()) + [('total', frame['total_ms'])]:
+                stats = stages.setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+                stats['count'] += 1
+                stats['total_ms'] += elapsed_ms
+                stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        return {
+            name: {
+                'avg_ms': round(stats['total_ms'] / stats['count'], 3),
+                'max_ms': round(stats['max_ms'], 3),
+                'count': stats['count']
+            }
+            for name, stats in stages.items()
+        }
+
+render_profiler = RenderProfiler()
 
+
+@lru_cache(maxsize=None)
 def get_emoji_font(size):
     """Get font for emojis"""
+    with render_profiler.stage('font_load'):
+        return load_emoji_font(size)
+
+def load_emoji_font(size):
     # Force a very small fixed size for emojis
     emoji_size = 10  # Try a fixed small size regardless of input size
 
@@ -98,8 +259,13 @@ def get_emoji_font(size):
             continue
     return pygame.font.Font(None, emoji_size)
 
+@lru_cache(maxsize=None)
 def get_text_font(size):
     """Get font for regular text"""
+    with render_profiler.stage('font_load'):
+        return load_text_font(size)
+
+def load_text_font(size):
     for font_path in FONT_PATHS:
         try:
             if os.path.exists(font_path):
@@ -183,18 +349,8 @@ def is_emoji(char):
 
     return False
 
-def render_mixed_text(text, size, color, bg_color=None):
-    """Render text with mixed emoji and regular characters"""
-    text_font = get_text_font(size)
-    emoji_font = get_emoji_font(size)
-
-    # First calculate total width
-    total_width = 0
-
-    # Get reference height for the text
-    ref_height = text_font.get_height()
-
-    # Process text to handle emoji sequences properly
+def split_display_chars(text):
+    """Split text into display characters, keeping emoji + variation selector pairs together"""
     processed_chars = []
     i = 0
     while i < len(text):
@@ -207,41 +363,96 @@ def render_mixed_text(text, size, color, bg_color=None):
         else:
             processed_chars.append(current_char)
             i += 1
+    return processed_chars
+
+@dataclass
+class TextLayout:
+    """Glyph layout of a message, shared by every frame and color of the same text"""
+    chars: list           # Display characters (emoji sequences kept together)
+    emoji_flags: list     # True for each character drawn with the emoji font
+    glyph_sizes: list     # (width, height) of each character, emoji already scaled
+    line_height: int
+    total_width: int
+    window_height: int
+    emoji_columns: list   # True for each pixel column covered by an emoji
+
+@lru_cache(maxsize=64)
+def get_text_layout(text, size) -> TextLayout:
+    """Measure text once per text and font size without rendering it"""
+    text_font = get_text_font(size)
+    emoji_font = get_emoji_font(size)
 
-    # Split text into characters and measure each
-    char_surfaces = []
-    for char in processed_chars:
-        if is_emoji(char):
-            surf = emoji_font.render(char, True, color)
+    # Get reference height for the text
+    ref_height = text_font.get_height()
+
+    chars = split_display_chars(text)
+    with render_profiler.stage('is_emoji'):
+        emoji_flags = [is_emoji(char) for char in chars]
+
+    glyph_sizes = []
+    emoji_columns = []
+    for char, emoji_char in zip(chars, emoji_flags):
+        if emoji_char:
+            width, height = emoji_font.size(char)
             # Scale emoji to fit the text height
-            scale_factor = min(1.0, (ref_height * 0.9) / surf.get_height())
-            scaled_width = int(surf.get_width() * scale_factor)
-            scaled_height = int(surf.get_height() * scale_factor)
+            scale_factor = min(1.0, (ref_height * 0.9) / height)
+            scaled_width = int(width * scale_factor)
+            scaled_height = int(height * scale_factor)
             if scaled_width > 0 and scaled_height > 0:
-                surf = pygame.transform.scale(surf, (scaled_width, scaled_height))
+                width, height = scaled_width, scaled_height
         else:
-            surf = text_font.render(char, True, color)
-
-        char_surfaces.append(surf)
-        total_width += surf.get_width()
+            width, height = text_font.size(char)
+
+        glyph_sizes.append((width, height))
+        emoji_columns.extend([emoji_char] * width)
+
+    return TextLayout(
+        chars=chars,
+        emoji_flags=emoji_flags,
+        glyph_sizes=glyph_sizes,
+        line_height=ref_height,
+        total_width=len(emoji_columns),
+        window_height=ref_height + 5,
+        emoji_columns=emoji_columns
+    )
+
+def render_mixed_text_with_mask(text, size, color):
+    """Render text with mixed emoji and regular characters.
+
+    Returns the rendered surface together with a per-column list of booleans
+    that is True where the column belongs to an emoji glyph.
+    """
+    layout = get_text_layout(text, size)
+    text_font = get_text_font(size)
+    emoji_font = get_emoji_font(size)
 
     # Create surface with text height as reference
-    surface = pygame.Surface((total_width, ref_height), pygame.SRCALPHA)
+    with render_profiler.stage('surface_alloc'):
+        surface = pygame.Surface((layout.total_width, layout.line_height), pygame.SRCALPHA)
 
     # Render each character
     x_pos = 0
-    for i, surf in enumerate(char_surfaces):
-        char = processed_chars[i]
-        if is_emoji(char):
-            # Center emoji vertically
-            y_pos = (ref_height - surf.get_height()) // 2
-        else:
-            # Regular text aligned to baseline
-            y_pos = (ref_height - surf.get_height()) // 4
+    with render_profiler.stage('glyph_render'):
+        for char, emoji_char, glyph_size in zip(layout.chars, layout.emoji_flags, layout.glyph_sizes):
+            if emoji_char:
+                surf = emoji_font.render(char, True, color)
+                if surf.get_size() != glyph_size:
+                    surf = pygame.transform.scale(surf, glyph_size)
+                # Center emoji vertically
+                y_pos = (layout.line_height - surf.get_height()) // 2
+            else:
+                surf = text_font.render(char, True, color)
+                # Regular text aligned to baseline
+                y_pos = (layout.line_height - surf.get_height()) // 4
+
+            surface.blit(surf, (x_pos, y_pos))
+            x_pos += glyph_size[0]
 
-        surface.blit(surf, (x_pos, y_pos))
-        x_pos += surf.get_width()
+    return surface, layout.emoji_columns
 
+def render_mixed_text(text, size, color, bg_color=None):
+    """Render text with mixed emoji and regular characters"""
+    surface, _ = render_mixed_text_with_mask(text, size, color)
     return surface
 
 def add_to_message_history(text, priority=1, color="#ffffff", bg_color="#000000"):
@@ -268,6 +479,9 @@ class Message:
     wav_path: str
     use_espeak: str
     id: str = ""
+    start_at: float = 0.0  # Synchronized start time (local clock), 0 to start immediately
+    received_at: float = 0.0  # When the message arrived on a socket or the web UI
+    enqueued_at: float = 0.0  # When the message was put on the display queue
 
     def __post_init__(self):
         if not self.id:
@@ -293,8 +507,11 @@ class MessageQueue:
             message_key = f"{msg.text}_{msg.priority}"
             if message_key not in self.recent_messages:
                 self.recent_messages.add(message_key)
+                msg.enqueued_at = time.time()
                 self.queue.put((msg.priority, msg))
                 threading.Timer(2.0, lambda: self.recent_messages.remove(message_key)).start()
+                return True
+        return False
 
     def get_message(self) -> Optional[Message]:
         try:
@@ -306,53 +523,19 @@ class MessageQueue:
             pass
         return None
 
-class NotificationHandler(SimpleHTTPRequestHandler):
-    def __init__(self, message_queue, *args, **kwargs):
-        self.message_queue = message_queue
-        super().__init__(*args, **kwargs)
-
-    def translate_path(self, path):
-        # Serve files from the static directory
-        if path == '/':
-            return os.path.join(os.path.dirname(__file__), 'static', 'index.html')
-        return os.path.join(os.path.dirname(__file__), 'static', path.lstrip('/'))
-
-    def do_POST(self):
-        if self.path == '/api/send-message':
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
-
-            # Convert hex colors to names or keep as hex
-            color = data.get('color', '#ffffff')
-            bg_color = data.get('bgColor', '#000000')
-
-            # Create message string in the expected format
-            message_str = (f"{data.get('priority', 1)}|"
-                         f"{data.get('blinkMode', 0)}|"
-                         f"{data.get('text', '')}|"
-                         f"{color}|{bg_color}|"
-                         f"{data.get('speed', 1.0)}||")
-
-            parse_and_queue_message(message_str)
-
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'status': 'success'}).encode())
-            return
-
-        return super().do_POST()
-
 # Global variables
 message_queue = MessageQueue()
+message_scheduler = None
 current_message = None
 message_visible = False
 window_visible = False
 screen = None
 blink_state = True
+display_client = None
+local_sock = None
+tcp_sock = None
 
-def start_webserver(port, message_queue=None):
+def start_webserver(port, message_queue=None, server='flask'):
     # Start cleanup thread for ignored messages
     def cleanup_ignored_messages():
         while True:
@@ -366,14 +549,24 @@ def start_webserver(port, message_queue=None):
     cleanup_thread = threading.Thread(target=cleanup_ignored_messages, daemon=True)
     cleanup_thread.start()
 
-    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
+    if server == 'waitress':
+        try:
+            from waitress import serve
+        except ImportError:
+            print("waitress is not installed, falling back to the Flask development server")
+        else:
+            # Threaded HTTP/1.1 server with keep-alive, the render loop keeps the main thread
+            serve(app, host='0.0.0.0', port=port, threads=WEBUI_THREADS, ident=None)
+            return
+
+    app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
 
 def get_screen_size():
     pygame.display.init()
     info = pygame.display.Info()
     return info.current_w, info.current_h
 
-def create_window():
+def create_window(height=100):
     global screen, window_visible
     try:
         if not window_visible:
@@ -382,7 +575,7 @@ def create_window():
             screen_width, _ = get_screen_size()
             os.putenv('SDL_VIDEO_WINDOW_POS', '0,0')
             os.environ['SDL_VIDEO_WINDOW_POS'] = '0,0'
-            screen = pygame.display.set_mode((screen_width, 100), pygame.NOFRAME | pygame.SHOWN)
+            screen = pygame.display.set_mode((screen_width, height), pygame.NOFRAME | pygame.SHOWN)
             window_visible = True
             time.sleep(0.1)
             return True
@@ -419,98 +612,117 @@ def play_audio(wav_path):
 
 def show_marquee(message: Message):
     global current_message, message_visible
-    if create_window():
-        current_message = message
-        message_visible = True
-
-def render_text_with_blink(text: str, font_size: int, color: str, blink_mode: int, has_emoji: bool) -> pygame.Surface:
-    """Render text with blinking support"""
-    global blink_state
-
-    # First render the complete text to get total dimensions
-    full_text_surface = render_mixed_text(text, font_size, pygame.Color(color))
-    total_width = full_text_surface.get_width()
-    total_height = full_text_surface.get_height()
-
-    # If not blinking or full text blink, return the appropriate surface
-    if blink_mode == 0 or (blink_mode == 3 and blink_state):
-        return full_text_surface
-
-    if blink_mode == 3 and not blink_state:
-        # Return empty surface of same size
-        return pygame.Surface((total_width, total_height), pygame.SRCALPHA)
-
-    # For modes 1 and 2 (partial blinking)
-    final_surface = pygame.Surface((total_width, total_height), pygame.SRCALPHA)
-
-    # Process text to handle emoji sequences properly
-    processed_chars = []
-    i = 0
-    while i < len(text):
-        current_char = text[i]
-
-        # Check if this character plus the next one might form an emoji sequence
-        if i + 1 < len(text) and ord(text[i+1]) == 0xFE0F:  # FE0F is variation selector
-            processed_chars.append(text[i:i+2])
-            i += 2
-        else:
-            processed_chars.append(current_char)
-            i += 1
-
-    # For partial blinking, render the full text again to ensure proper scaling
-    if blink_mode in (1, 2):
-        x_pos = 0
-        for char in processed_chars:
-            is_emoji_char = is_emoji(char)
-            should_blink = (
-                (blink_mode == 1 and not is_emoji_char) or
-                (blink_mode == 2 and is_emoji_char)
-            )
-
-            # Render each character
-            if is_emoji_char:
-                emoji_font = get_emoji_font(font_size)
-                char_surface = emoji_font.render(char, True, pygame.Color(color))
-
-                # Scale emoji to fit within the height
-                ref_height = get_text_font(font_size).get_height()
-                scale_factor = min(1.0, (ref_height * 0.9) / char_surface.get_height())
-                scaled_width = int(char_surface.get_width() * scale_factor)
-                scaled_height = int(char_surface.get_height() * scale_factor)
+    # The setup frame stays open until update_marquee has pre-rendered the message
+    render_profiler.start_frame('setup', message.id)
 
-                if scaled_width > 0 and scaled_height > 0:
-                    char_surface = pygame.transform.scale(char_surface, (scaled_width, scaled_height))
+    # Create the window at the message height so it is not reallocated right away,
+    # a window kept open from the previous message is reused and resized if needed
+    with render_profiler.stage('layout'):
+        layout = get_text_layout(message.text, MARQUEE_FONT_SIZE)
+    if window_visible:
+        created = True
+    else:
+        with render_profiler.stage('create_window'):
+            created = create_window(layout.window_height)
 
-                # Center emoji vertically
-                y_pos = (total_height - char_surface.get_height()) // 2
-            else:
-                char_surface = get_text_font(font_size).render(char, True, pygame.Color(color))
-                y_pos = (total_height - char_surface.get_height()) // 4
+    if created:
+        current_message = message
+        message_visible = True
+    else:
+        render_profiler.end_frame()
+        report_message_done(message)
 
-            if not should_blink or blink_state:
-                final_surface.blit(char_surface, (x_pos, y_pos))
+def report_message_done(message: Message):
+    """Tell the hub a message is finished, whether it was shown or skipped"""
+    if display_client is not None:
+        display_client.report_done(message.id)
 
-            x_pos += char_surface.get_width()
+def abandon_current_message():
+    """Drop the current message when its window is gone before it could be shown"""
+    global current_message, message_visible
+    render_profiler.end_frame()
+    if current_message is not None:
+        report_message_done(current_message)
+    current_message = None
+    message_visible = False
 
-        return final_surface
+@dataclass
+class BakedText:
+    """Pre-rendered message surfaces for the on and off phases of a blink"""
+    on_surface: pygame.Surface
+    off_surface: pygame.Surface
+
+def mask_blink_columns(surface, keep_columns):
+    """Zero the alpha of every column of surface where keep_columns is False"""
+    if numpy is not None:
+        # Single vectorized multiply over the per-pixel alpha channel
+        alpha = pygame.surfarray.pixels_alpha(surface)
+        alpha *= numpy.asarray(keep_columns, dtype=numpy.uint8)[:, None]
+        del alpha  # Release the surface lock
+        return
+
+    # Without NumPy, clear each contiguous run of hidden columns with one fill
+    run_start = None
+    for x, keep in enumerate(list(keep_columns) + [True]):
+        if not keep and run_start is None:
+            run_start = x
+        elif keep and run_start is not None:
+            surface.fill((0, 0, 0, 0), pygame.Rect(run_start, 0, x - run_start, surface.get_height()))
+            run_start = None
+
+# A long message bakes to two full-width surfaces, often tens of MB, so only keep
+# the current message and a few recent repeats
+@lru_cache(maxsize=4)
+def bake_text_with_blink(text: str, font_size: int, color: str, blink_mode: int) -> BakedText:
+    """Render a message once and derive its blink "off" phase from a column mask"""
+    on_surface, emoji_columns = render_mixed_text_with_mask(text, font_size, pygame.Color(color))
+
+    if blink_mode == 0:
+        return BakedText(on_surface, on_surface)
+
+    if blink_mode == 3:
+        # Whole message blinks, so the off phase is an empty surface of same size
+        with render_profiler.stage('surface_alloc'):
+            off_surface = pygame.Surface(on_surface.get_size(), pygame.SRCALPHA)
+        return BakedText(on_surface, off_surface)
+
+    # Mode 1 blinks the text and keeps emoji, mode 2 blinks emoji and keeps text
+    if blink_mode == 1:
+        keep_columns = emoji_columns
+    elif blink_mode == 2:
+        keep_columns = [not is_emoji_column for is_emoji_column in emoji_columns]
+    else:
+        # Unknown modes show the full text without blinking
+        return BakedText(on_surface, on_surface)
+
+    with render_profiler.stage('surface_alloc'):
+        off_surface = on_surface.copy()
+    with render_profiler.stage('blink_mask'):
+        mask_blink_columns(off_surface, keep_columns)
+    return BakedText(on_surface, off_surface)
 
-    return full_text_surface
+def render_text_with_blink(text: str, font_size: int, color: str, blink_mode: int, has_emoji: bool) -> pygame.Surface:
+    """Render text with blinking support"""
+    with render_profiler.stage('bake'):
+        baked = bake_text_with_blink(text, font_size, color, blink_mode)
+    return baked.on_surface if blink_state else baked.off_surface
 
 def update_marquee():
     global current_message, message_visible, screen, blink_state
+    if current_message is not None and screen is None:
+        abandon_current_message()
     if current_message is not None and screen is not None:
         try:
-            font_size = 70  # Define font size here if it works
-            font = get_font_with_emoji_support(font_size)  # Get font for initial measurement only
+            font_size = MARQUEE_FONT_SIZE
             has_emoji = current_message.has_emoji()
 
-            # Get initial text dimensions
-            temp_text = font.render(current_message.text, True, pygame.Color(current_message.color))
-            text_rect = temp_text.get_rect()
-            screen_height = text_rect.height + 5
-
-            # Set up the window size
-            pygame.display.set_mode((screen.get_width(), screen_height), pygame.NOFRAME | pygame.SHOWN)
+            # Reuse the cached layout and only reallocate the framebuffer if the height changed
+            with render_profiler.stage('layout'):
+                layout = get_text_layout(current_message.text, font_size)
+            if screen.get_height() != layout.window_height:
+                with render_profiler.stage('set_mode'):
+                    screen = pygame.display.set_mode((screen.get_width(), layout.window_height),
+                                                     pygame.NOFRAME | pygame.SHOWN)
 
             # Parse background color
             try:
@@ -519,7 +731,8 @@ def update_marquee():
                 bg_color = pygame.Color(0, 0, 0)
 
             # For scrolling
-            x = screen.get_width()
+            start_x = screen.get_width()
+            x = start_x
 
             # Pre-render the text to get its full width
             full_text = render_text_with_blink(
@@ -530,14 +743,24 @@ def update_marquee():
                 has_emoji
             )
             text_width = full_text.get_width()
+            render_profiler.end_frame()
 
             # Slow down the blinking
             blink_counter = 0
+            first_frame = True
+
+            # Hold a hub-scheduled message until its synchronized start time
+            synced = current_message.start_at > 0 and current_message.speed > 0
+            if synced:
+                delay = current_message.start_at - time.time()
+                if delay > 0:
+                    time.sleep(delay)
 
             # Continue until the entire text has scrolled off the left side of the screen
             while x > -(text_width):  # Changed condition to use actual text width
                 if not window_visible:
                     break
+                render_profiler.start_frame('frame', current_message.id)
 
                 # Update blink state every 30 frames (slower blink)
                 blink_counter += 1
@@ -554,22 +777,54 @@ def update_marquee():
                     has_emoji
                 )
 
-                screen.fill(bg_color)
-                screen.blit(rendered_text, (x, 10))
-                pygame.display.flip()
-
-                x -= 5
-                pygame.time.delay(int(current_message.speed * 1000))
+                with render_profiler.stage('fill'):
+                    screen.fill(bg_color)
+                with render_profiler.stage('blit'):
+                    screen.blit(rendered_text, (x, MARQUEE_TEXT_Y))
+                with render_profiler.stage('flip'):
+                    pygame.display.flip()
+
+                if first_frame:
+                    record_display_latency(current_message)
+                    first_frame = False
+
+                if synced:
+                    # Derive the position from the shared clock so displays stay in step
+                    frames = int((time.time() - current_message.start_at) / current_message.speed) + 1
+                    x = start_x - 5 * frames
+                else:
+                    x -= 5
+                with render_profiler.stage('delay'):
+                    pygame.time.delay(int(current_message.speed * 1000))
+                render_profiler.end_frame()
 
         except Exception as e:
             print(f"Error in update_marquee: {e}")
             print(f"Error details: {str(e)}")
+            failed = True
+        else:
+            failed = False
         finally:
+            render_profiler.end_frame()
+            report_message_done(current_message)
             current_message = None
             message_visible = False
-            destroy_window()
+            # Keep the window and its framebuffer for back-to-back messages
+            if failed or message_queue.queue.empty():
+                destroy_window()
 
-def parse_and_queue_message(data):
+def record_display_latency(msg: Message):
+    """Record how long msg took from ingest to queue and from queue to its first frame"""
+    displayed_at = time.time()
+    latency_log.append({
+        'id': msg.id,
+        'text': msg.text,
+        'received_at': msg.received_at,
+        'ingest_to_enqueue_ms': (msg.enqueued_at - msg.received_at) * 1000 if msg.received_at else None,
+        'enqueue_to_display_ms': (displayed_at - msg.enqueued_at) * 1000 if msg.enqueued_at else None
+    })
+
+def parse_and_queue_message(data, received_at=None):
     try:
         print(f"Parsing message: {data}")
         parts = data.split("|")
@@ -619,7 +874,8 @@ def parse_and_queue_message(data):
             speed=float(speed),
             wav_path=wav_path,
             use_espeak=use_espeak,
-            id=message_id
+            id=message_id,
+            received_at=received_at or time.time()
         )
 
         print(f"Created message object: {msg}")
@@ -641,6 +897,7 @@ def socket_listener():
             try:
                 print(f"Accepting connection on socket {sock}")
                 connection, client_address = sock.accept()
+                received_at = time.time()
                 print(f"Connection accepted from {client_address}")
                 connection.settimeout(5.0)
 
@@ -649,7 +906,7 @@ def socket_listener():
 
                 if data:
                     # This will now log the message through parse_and_queue_message
-                    parse_and_queue_message(data)
+                    parse_and_queue_message(data, received_at)
                 connection.close()
             except Exception as e:
                 print(f"Error handling connection: {e}")
@@ -676,9 +933,700 @@ def check_queue():
         if msg.wav_path:
             play_audio(msg.wav_path)
 
+def parse_hub_address(address):
+    """Return (family, address) for a hub address given as HOST[:PORT] or a Unix socket path"""
+    if address.startswith('/'):
+        return socket.AF_UNIX, address
+    host, _, port = address.rpartition(':')
+    if not host:
+        host, port = port, hub_port
+    return socket.AF_INET, (host, int(port))
+
+def encode_hub_frame(payload):
+    """Encode a hub protocol frame as a single JSON line"""
+    return (json.dumps(payload) + "\n").encode('utf-8')
+
+def read_hub_frames(sock, buffer):
+    """Read from sock and return (frames, remaining buffer), or (None, buffer) on disconnect"""
+    data = sock.recv(4096)
+    if not data:
+        return None, buffer
+    buffer += data
+    frames = []
+    while b"\n" in buffer:
+        line, buffer = buffer.split(b"\n", 1)
+        if not line.strip():
+            continue
+        try:
+            frame = json.loads(line.decode('utf-8'))
+        except ValueError as e:
+            print(f"Ignoring malformed hub frame: {e}")
+            continue
+        if not isinstance(frame, dict):
+            print(f"Ignoring hub frame that is not an object: {line[:80]!r}")
+            continue
+        frames.append(frame)
+    return frames, buffer
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def message_from_fields(fields):
+    """Build a Message from hub frame fields, ignoring fields this version does not know"""
+    known = {field.name for field in dataclass_fields(Message)}
+    return Message(**{key: value for key, value in fields.items() if key in known})
+
+def estimate_scroll_time(msg: Message):
+    """Upper bound on the seconds a display needs to scroll msg off the screen"""
+    text_width = len(msg.text) * MARQUEE_FONT_SIZE  # No glyph is wider than the font size
+    frames = (HUB_MAX_SCREEN_WIDTH + text_width) / 5
+    return HUB_START_LEAD + frames * (max(msg.speed, 0) + HUB_FRAME_OVERHEAD) + HUB_DONE_MARGIN
+
+class DisplayHub:
+    """Owns the message queue and fans scheduled messages out to display clients.
+
+    Each message is encoded once and the same bytes are sent to every client,
+    with a start time on the hub clock so all displays scroll in step.
+    """
+
+    def __init__(self, address):
+        self.family, self.address = parse_hub_address(address)
+        self.server_sock = None
+        self.clients = {}  # {socket: receive buffer}
+        self.send_locks = {}  # {socket: lock serializing sync replies and broadcasts}
+        self.pending = {}  # {message_id: set of sockets still displaying it}
+        self.lock = threading.Condition()
+
+    def start(self):
+        if self.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                if os.path.exists(self.address):
+                    raise
+        self.server_sock = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_INET:
+            self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server_sock.bind(self.address)
+        self.server_sock.listen(64)
+        if self.family == socket.AF_UNIX:
+            os.chmod(self.address, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
+        threading.Thread(target=self._serve, daemon=True).start()
+        print(f"Hub listening for display clients on {self.address}")
+
+    def _serve(self):
+        while True:
+            with self.lock:
+                read_sockets = [self.server_sock] + list(self.clients)
+            try:
+                readable, _, _ = select.select(read_sockets, [], [], 1.0)
+            except (OSError, ValueError):
+                # A client was dropped by broadcast() while we were selecting on it
+                continue
+
+            for sock in readable:
+                # One misbehaving client must never stop the hub from serving the others
+                try:
+                    self._serve_socket(sock)
+                except Exception as e:
+                    print(f"Error serving display client: {e}")
+                    if sock is not self.server_sock:
+                        self._drop_client(sock)
+
+    def _serve_socket(self, sock):
+        if sock is self.server_sock:
+            connection, client_address = sock.accept()
+            connection.settimeout(2.0)
+            with self.lock:
+                self.clients[connection] = b""
+                self.send_locks[connection] = threading.Lock()
+                self.lock.notify_all()
+            print(f"Display client connected: {client_address or connection.fileno()}")
+            return
+
+        try:
+            frames, buffer = read_hub_frames(sock, self.clients.get(sock, b""))
+        except (OSError, ValueError) as e:
+            print(f"Error reading from display client: {e}")
+            frames = None
+        if frames is None:
+            self._drop_client(sock)
+            return
+
+        with self.lock:
+            self.clients[sock] = buffer
+        for frame in frames:
+            try:
+                self._handle_frame(sock, frame)
+            except Exception as e:
+                print(f"Ignoring bad frame from display client {frame!r:.80}: {e}")
+
+    def _handle_frame(self, sock, frame):
+        if frame.get('type') == 'sync' and is_number(frame.get('client_time')):
+            self._send(sock, encode_hub_frame({
+                'type': 'sync',
+                'client_time': frame['client_time'],
+                'hub_time': time.time()
+            }))
+        elif frame.get('type') == 'done' and isinstance(frame.get('id'), str):
+            with self.lock:
+                waiting = self.pending.get(frame.get('id'))
+                if waiting is not None:
+                    waiting.discard(sock)
+                    self.lock.notify_all()
+
+    def _send(self, sock, data):
+        with self.lock:
+            send_lock = self.send_locks.get(sock)
+        if send_lock is None:
+            return False  # Already dropped
+        try:
+            # _serve and broadcast() both write, keep each JSON line whole
+            with send_lock:
+                sock.sendall(data)
+            return True
+        except OSError as e:
+            print(f"Dropping display client: {e}")
+            self._drop_client(sock)
+            return False
+
+    def _drop_client(self, sock):
+        with self.lock:
+            if self.clients.pop(sock, None) is None:
+                return
+            self.send_locks.pop(sock, None)
+            for waiting in self.pending.values():
+                waiting.discard(sock)
+            self.lock.notify_all()
+        sock.close()
+        print("Display client disconnected")
+
+    def broadcast(self, msg: Message):
+        """Send msg to every connected client and return its synchronized start time.
+
+        Returns None if no client received the message.
+        """
+        start_at = time.time() + HUB_START_LEAD
+        fields = asdict(msg)
+        fields['start_at'] = start_at
+        data = encode_hub_frame({'type': 'show', 'message': fields})
+
+        with self.lock:
+            targets = list(self.clients)
+            self.pending[msg.id] = set(targets)
+        delivered = sum(self._send(sock, data) for sock in targets)
+        print(f"Broadcast message {msg.id} to {delivered} display client(s)")
+        if not delivered:
+            with self.lock:
+                self.pending.pop(msg.id, None)
+            return None
+        return start_at
+
+    def wait_until_displayed(self, message_id, timeout):
+        """Block until every client that received message_id reports it finished"""
+        deadline = time.time() + timeout
+        with self.lock:
+            while self.pending.get(message_id):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    print(f"Timed out waiting for display clients on message {message_id}")
+                    break
+                self.lock.wait(remaining)
+            self.pending.pop(message_id, None)
+
+    def wait_for_clients(self):
+        """Block until at least one display client is connected"""
+        with self.lock:
+            if not self.clients:
+                print("Waiting for a display client to connect")
+            while not self.clients:
+                self.lock.wait()
+
+    def run(self):
+        """Hub main loop: schedule queued messages one at a time across all displays"""
+        while True:
+            # Leave messages queued while there is no display to show them on
+            self.wait_for_clients()
+            msg = message_queue.get_message()
+            if not msg:
+                time.sleep(0.1)
+                continue
+
+            if self.broadcast(msg) is None:
+                # Every client went away before the message reached one, keep it for the next
+                message_queue.queue.put((msg.priority, msg))
+                continue
+            self.wait_until_displayed(msg.id, estimate_scroll_time(msg))
+
+class DisplayClient:
+    """Thin display that receives already-parsed messages from a hub.
+
+    on_message is called with each Message, whose start_at has been converted
+    to the local clock. By default messages go to the local message queue.
+    """
+
+    def __init__(self, address, on_message=None):
+        self.family, self.address = parse_hub_address(address)
+        self.on_message = on_message or self.queue_message
+        self.sock = None
+        self.send_lock = threading.Lock()
+        self.clock_offset = 0.0  # hub time minus local time
+        self.best_rtt = None
+        self.next_sync = 0.0
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.sock = socket.socket(self.family, socket.SOCK_STREAM)
+                self.sock.connect(self.address)
+                print(f"Connected to hub at {self.address}")
+                self._receive()
+            except Exception as e:
+                # Keep reconnecting whatever went wrong, this thread is the display's only link
+                print(f"Hub connection error: {e}")
+            finally:
+                if self.sock is not None:
+                    self.sock.close()
+                    self.sock = None
+            time.sleep(2)
+
+    def _receive(self):
+        buffer = b""
+        self.best_rtt = None
+        self.next_sync = 0.0
+        while True:
+            if time.time() >= self.next_sync:
+                self._request_sync()
+            readable, _, _ = select.select([self.sock], [], [], 1.0)
+            if not readable:
+                continue
+            frames, buffer = read_hub_frames(self.sock, buffer)
+            if frames is None:
+                print("Hub closed the connection")
+                return
+            for frame in frames:
+                try:
+                    self._handle_frame(frame)
+                except Exception as e:
+                    print(f"Ignoring bad frame from hub {frame!r:.80}: {e}")
+
+    def _request_sync(self):
+        # A fresh round lets the offset follow clock drift between rounds
+        self.best_rtt = None
+        for _ in range(HUB_SYNC_SAMPLES):
+            self._send({'type': 'sync', 'client_time': time.time()})
+        self.next_sync = time.time() + HUB_SYNC_INTERVAL
+
+    def _handle_frame(self, frame):
+        if frame.get('type') == 'sync':
+            if not (is_number(frame.get('client_time')) and is_number(frame.get('hub_time'))):
+                raise ValueError("sync frame needs numeric client_time and hub_time")
+            now = time.time()
+            rtt = now - frame['client_time']
+            # Keep the sample with the smallest round trip, it has the least queuing error
+            if self.best_rtt is None or rtt < self.best_rtt:
+                self.best_rtt = rtt
+                self.clock_offset = frame['hub_time'] - (frame['client_time'] + now) / 2
+        elif frame.get('type') == 'show':
+            if not isinstance(frame.get('message'), dict):
+                raise ValueError("show frame needs a message object")
+            msg = message_from_fields(frame['message'])
+            msg.start_at -= self.clock_offset
+            self.on_message(msg)
+
+    def _send(self, payload):
+        with self.send_lock:
+            if self.sock is not None:
+                self.sock.sendall(encode_hub_frame(payload))
+
+    def queue_message(self, msg: Message):
+        """Default on_message: queue msg locally, replying at once if it is dropped"""
+        if not message_queue.add_message(msg):
+            print(f"Skipping repeated message {msg.id}")
+            self.report_done(msg.id)
+
+    def report_done(self, message_id):
+        """Tell the hub this display has finished scrolling message_id"""
+        try:
+            self._send({'type': 'done', 'id': message_id})
+        except OSError as e:
+            print(f"Failed to report message done to hub: {e}")
+
+CRON_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+def parse_cron_field(field, low, high):
+    """Expand one cron field (*, */n, a, a-b, a-b/n and comma lists) into a set of values"""
+    values = set()
+    for part in field.split(','):
+        part, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(v) for v in part.split('-', 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronExpression:
+    """Five field cron expression: minute hour day-of-month month day-of-week (local time)"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELD_RANGES)
+        )
+        if 7 in self.weekdays:
+            self.weekdays.add(0)  # Both 0 and 7 mean Sunday
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def day_matches(self, dt):
+        weekday = (dt.weekday() + 1) % 7  # Cron counts from Sunday
+        if self.any_day and self.any_weekday:
+            return True
+        if self.any_day:
+            return weekday in self.weekdays
+        if self.any_weekday:
+            return dt.day in self.days
+        # Like cron, a restricted day-of-month and day-of-week match either
+        return dt.day in self.days or weekday in self.weekdays
+
+    def next_after(self, timestamp):
+        """Return the first matching minute strictly after timestamp"""
+        # Walk real instants and only read local time from them, so the repeated hour
+        # when clocks go back is visited twice and the result always moves forward
+        ts = (int(timestamp) // 60 + 1) * 60
+        limit = ts + 366 * 5 * 86400
+        while ts < limit:
+            dt = datetime.fromtimestamp(ts)
+            if dt.month not in self.months:
+                jump = (dt.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+            elif not self.day_matches(dt):
+                jump = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+            elif dt.hour not in self.hours:
+                jump = (dt + timedelta(hours=1)).replace(minute=0)
+            elif dt.minute not in self.minutes:
+                ts += 60
+                continue
+            else:
+                return float(ts)
+            ts = max(int(jump.timestamp()), ts + 60)
+        raise ValueError("Cron expression never matches")
+
+@lru_cache(maxsize=256)
+def parse_cron(expression):
+    return CronExpression(expression)
+
+@dataclass
+class Schedule:
+    """A message queued once at start_at, every interval seconds from start_at, or on a cron expression"""
+    text: str
+    priority: int = 1
+    blink_mode: int = 0
+    color: str = "#ffffff"
+    bg_color: str = "#000000"
+    speed: float = 1.0
+    wav_path: str = ""
+    start_at: float = 0.0
+    interval: float = 0.0
+    cron: str = ""
+    id: str = ""
+    next_run: float = 0.0
+
+    def __post_init__(self):
+        if not self.id:
+            self.id = str(uuid.uuid4())
+
+    @property
+    def kind(self):
+        if self.cron:
+            return 'cron'
+        return 'interval' if self.interval > 0 else 'once'
+
+    def first_run(self, now):
+        """Return the first run time of a new schedule, a start_at in the past runs right away"""
+        if self.cron:
+            return self.next_run_after(now)
+        return self.start_at
+
+    def resume_run(self, now):
+        """Return the next run time of a schedule loaded from disk"""
+        run_at = self.next_run or self.first_run(now)
+        if run_at < now and self.kind != 'once':
+            # Skip runs missed while the server was down, a missed one-shot still runs
+            return self.next_run_after(now)
+        return run_at
+
+    def next_run_after(self, now):
+        """Return the first run time strictly after now, or None once the schedule is finished"""
+        if self.cron:
+            return parse_cron(self.cron).next_after(now)
+        if self.interval > 0:
+            if now < self.start_at:
+                return self.start_at
+            return self.start_at + (int((now - self.start_at) // self.interval) + 1) * self.interval
+        return None
+
+    def message_string(self):
+        return (f"{self.priority}|{self.blink_mode}|{self.text}|"
+                f"{self.color}|{self.bg_color}|{self.speed}|{self.wav_path}|")
+
+    def to_dict(self):
+        entry = asdict(self)
+        entry['kind'] = self.kind
+        entry['next_run_time'] = datetime.fromtimestamp(self.next_run).strftime('%Y-%m-%d %H:%M:%S')
+        return entry
+
+def schedule_from_request(data):
+    """Build a Schedule from a web UI style JSON request, raising ValueError if it is invalid"""
+    if not isinstance(data, dict):
+        raise ValueError("Schedule must be a JSON object")
+    text = str(data.get('text', '')).strip()
+    if not text:
+        raise ValueError("Schedule needs a message text")
+    if '|' in text:
+        raise ValueError("Message text cannot contain '|'")
+
+    at = data.get('at')
+    if at is None or at == '':
+        start_at = time.time()
+    elif isinstance(at, (int, float)):
+        start_at = float(at)
+    else:
+        start_at = datetime.fromisoformat(str(at)).timestamp()
+
+    interval = float(data.get('interval') or 0)
+    cron = str(data.get('cron') or '').strip()
+    if interval and cron:
+        raise ValueError("Use either interval or cron, not both")
+    if interval and interval < MIN_SCHEDULE_INTERVAL:
+        raise ValueError(f"Interval must be at least {MIN_SCHEDULE_INTERVAL} seconds")
+    if cron:
+        parse_cron(cron).next_after(time.time())  # Rejects expressions that never match
+
+    return Schedule(
+        text=text,
+        priority=int(data.get('priority', 1)),
+        blink_mode=int(data.get('blinkMode', 0)),
+        color=data.get('color', '#ffffff'),
+        bg_color=data.get('bgColor', '#000000'),
+        speed=float(data.get('speed', 1.0)),
+        wav_path=data.get('wavPath', ''),
+        start_at=start_at,
+        interval=interval,
+        cron=cron
+    )
+
+class MessageScheduler:
+    """Queues scheduled messages from a single thread using a heap ordered by next run time.
+
+    Cancelled and rescheduled entries stay in the heap and are skipped when
+    popped, so adding and cancelling are O(log n) without a thread per schedule.
+    Changes are written to disk by the scheduler thread, so bursts of API calls
+    are coalesced into a single save.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.schedules = {}  # {schedule_id: Schedule}
+        self.heap = []       # [(next_run, schedule_id)]
+        self.dirty = False   # Schedules changed since the last save
+        self.condition = threading.Condition()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load schedules from {self.path}: {e}")
+            return
+
+        now = time.time()
+        with self.condition:
+            for entry in entries:
+                try:
+                    schedule = Schedule(**entry)
+                    self._push(schedule, schedule.resume_run(now))
+                except (TypeError, ValueError) as e:
+                    print(f"Skipping invalid schedule {entry}: {e}")
+            self.condition.notify()
+        print(f"Loaded {len(self.schedules)} schedule(s) from {self.path}")
+
+    def save(self):
+        """Write all schedules to disk, the caller must hold the condition lock"""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump([asdict(schedule) for schedule in self.schedules.values()], f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Failed to save schedules to {self.path}: {e}")
+
+    def _push(self, schedule, run_at):
+        schedule.next_run = run_at
+        self.schedules[schedule.id] = schedule
+        heapq.heappush(self.heap, (run_at, schedule.id))
+
+    def add(self, schedule):
+        with self.condition:
+            self._push(schedule, schedule.first_run(time.time()))
+            self.dirty = True
+            self.condition.notify()
+        print(f"Scheduled message {schedule.id} ({schedule.kind}) next at "
+              f"{datetime.fromtimestamp(schedule.next_run)}")
+        return schedule
+
+    def cancel(self, schedule_id):
+        with self.condition:
+            if self.schedules.pop(schedule_id, None) is None:
+                return False
+            self.dirty = True
+            self.condition.notify()
+        print(f"Cancelled schedule {schedule_id}")
+        return True
+
+    def list(self):
+        with self.condition:
+            return sorted(self.schedules.values(), key=lambda schedule: schedule.next_run)
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            due = []
+            with self.condition:
+                now = time.time()
+                while self.heap and self.heap[0][0] <= now:
+                    run_at, schedule_id = heapq.heappop(self.heap)
+                    schedule = self.schedules.get(schedule_id)
+                    if schedule is None or schedule.next_run != run_at:
+                        continue  # Cancelled, or superseded by a newer heap entry
+
+                    due.append(schedule)
+                    try:
+                        next_run = schedule.next_run_after(now)
+                    except ValueError as e:
+                        print(f"Removing schedule {schedule_id}, it has no next run: {e}")
+                        next_run = None
+                    if next_run is not None and next_run <= now:
+                        # Re-pushing a due time would spin here while holding the lock
+                        print(f"Schedule {schedule_id} computed a past run time, retrying in a minute")
+                        next_run = now + 60
+                    if next_run is None:
+                        del self.schedules[schedule_id]
+                        self.dirty = True
+                    else:
+                        self._push(schedule, next_run)
+                if self.dirty:
+                    self.save()
+                    self.dirty = False
+                if not due:
+                    timeout = self.heap[0][0] - now if self.heap else None
+                    self.condition.wait(timeout)
+
+            for schedule in due:
+                print(f"Running schedule {schedule.id}: {schedule.text}")
+                parse_and_queue_message(schedule.message_string())
+
+@dataclass
+class StaticAsset:
+    """A static file held in memory with its ETag and gzipped body"""
+    mtime: float
+    etag: str
+    mimetype: str
+    body: bytes
+    gzip_body: Optional[bytes]
+
+def load_static_asset(path):
+    """Return the cached StaticAsset for path, reloading it when the file changes"""
+    mtime = os.path.getmtime(path)
+    with static_assets_lock:
+        asset = static_assets.get(path)
+        if asset is not None and asset.mtime == mtime:
+            return asset
+
+    with open(path, 'rb') as f:
+        body = f.read()
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    compressible = mimetype.startswith('text/') or mimetype in ('application/javascript', 'application/json')
+    asset = StaticAsset(
+        mtime=mtime,
+        etag=hashlib.sha1(body).hexdigest(),
+        mimetype=mimetype,
+        body=body,
+        gzip_body=gzip.compress(body, mtime=0) if compressible else None
+    )
+    with static_assets_lock:
+        static_assets[path] = asset
+    return asset
+
+def send_static_asset(directory, filename):
+    """Serve a static file from memory with ETag revalidation and gzip encoding"""
+    path = os.path.realpath(os.path.join(directory, filename))
+    if not path.startswith(os.path.realpath(directory) + os.sep) or not os.path.isfile(path):
+        return jsonify({'status': 'error', 'message': 'Not found'}), 404
+
+    asset = load_static_asset(path)
+    use_gzip = asset.gzip_body is not None and 'gzip' in request.headers.get('Accept-Encoding', '')
+
+    if asset.etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(asset.gzip_body if use_gzip else asset.body, mimetype=asset.mimetype)
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(asset.etag)
+    response.headers['Cache-Control'] = 'no-cache'  # Always revalidate, a 304 is cheap
+    if asset.gzip_body is not None:
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.before_request
+def restrict_display_client_routes():
+    # A display client renders but the hub owns messages, so it only serves the profiler
+    if webui_display_client and request.endpoint not in DISPLAY_CLIENT_ENDPOINTS:
+        return jsonify({'status': 'error', 'message': 'Display clients only serve /api/profile'}), 404
+
+@app.after_request
+def record_request_timing(response):
+    start = g.pop('request_start', None)
+    if start is None:
+        return response
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    response.headers['Server-Timing'] = f'app;dur={elapsed_ms:.2f}'
+
+    endpoint = request.endpoint or 'unknown'
+    with request_timings_lock:
+        stats = request_timings.setdefault(endpoint, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+    return response
+
 @app.route('/')
 def index():
-    return send_from_directory(app.static_folder, 'index.html')
+    return send_static_asset(app.static_folder, 'index.html')
+
+@app.endpoint('static')
+def serve_static(filename):
+    return send_static_asset(app.static_folder, filename)
 
 @app.route('/sounds/<path:filename>')
 def serve_sound(filename):
@@ -686,6 +1634,7 @@ def serve_sound(filename):
 
 @app.route('/api/send-message', methods=['POST'])
 def send_message():
+    received_at = time.time()
     try:
         data = request.get_json()
 
@@ -700,7 +1649,7 @@ def send_message():
                      f"{color}|{bg_color}|"
                      f"{data.get('speed', 1.0)}||")
 
-        parse_and_queue_message(message_str)
+        parse_and_queue_message(message_str, received_at)
 
         return jsonify({'status': 'success'})
     except Exception as e:
@@ -738,20 +1687,82 @@ def ignore_message():
 
     return jsonify({'status': 'success'})
 
+@app.route('/api/request-timing', methods=['GET'])
+def get_request_timing():
+    with request_timings_lock:
+        return jsonify({
+            endpoint: {
+                'count': stats['count'],
+                'avg_ms': round(stats['total_ms'] / stats['count'], 3),
+                'max_ms': round(stats['max_ms'], 3)
+            }
+            for endpoint, stats in request_timings.items()
+        })
+
+@app.route('/api/schedules', methods=['GET'])
+def list_schedules():
+    return jsonify([schedule.to_dict() for schedule in message_scheduler.list()])
+
+@app.route('/api/schedules', methods=['POST'])
+def create_schedule():
+    try:
+        schedule = schedule_from_request(request.get_json(silent=True) or {})
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    message_scheduler.add(schedule)
+    return jsonify({'status': 'success', 'schedule': schedule.to_dict()})
+
+@app.route('/api/schedules/<schedule_id>', methods=['DELETE'])
+def cancel_schedule(schedule_id):
+    if not message_scheduler.cancel(schedule_id):
+        return jsonify({'status': 'error', 'message': 'Schedule not found'}), 404
+    return jsonify({'status': 'success'})
+
+@app.route('/api/profile', methods=['GET'])
+def get_profile():
+    limit = request.args.get('limit', 100, type=int)
+    frames = list(render_profiler.frames)[-limit:] if limit > 0 else []
+    with render_profiler.lock:
+        capture = {
+            'frames_remaining': render_profiler.capture_frames,
+            'time': render_profiler.capture_time,
+            'report': render_profiler.capture_report
+        }
+    return jsonify({
+        'enabled': render_profiler.enabled,
+        'summary': render_profiler.summary(),
+        'frames': frames,
+        'capture': capture
+    })
+
+@app.route('/api/profile', methods=['POST'])
+def update_profile():
+    data = request.get_json(silent=True)
+    if data is None and not request.get_data():
+        data = {}  # An empty POST just reports the current state
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Profile settings must be a JSON object'}), 400
+    try:
+        if 'enabled' in data:
+            render_profiler.enabled = bool(data['enabled'])
+        if data.get('clear'):
+            render_profiler.frames.clear()
+        if data.get('captureFrames'):
+            render_profiler.request_capture(data['captureFrames'])
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    return jsonify({'status': 'success', 'enabled': render_profiler.enabled})
+
 @app.route('/api/current_message', methods=['GET'])
 def get_current_message():
     # Return empty response since we're not using this endpoint
     return jsonify({'message': None})
 
 
-if __name__ == "__main__":
-    args = parse_arguments()
-
-    print("\nServer Configuration:")
-    print(f"Unix Socket: Enabled at {sock_path}")
-    print(f"TCP Socket: {'Enabled' if args.tcp else 'Disabled'} (Port {tcp_port})")
-    print(f"Web UI: {'Enabled' if args.webui else 'Disabled'} (Port {args.webui_port})")
-
+def open_ingest_sockets(enable_tcp=False):
+    """Bind the Unix socket at sock_path and, if enabled, the TCP socket on tcp_port"""
+    global local_sock, tcp_sock
     try:
         os.unlink(sock_path)
     except OSError:
@@ -764,42 +1775,86 @@ if __name__ == "__main__":
     os.chmod(sock_path, stat.S_IRWXU | stat.S_IRWXG | stat.S_IRWXO)
 
     tcp_sock = None
-    if args.tcp:
+    if enable_tcp:
         tcp_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         tcp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         tcp_sock.bind(('0.0.0.0', tcp_port))
         tcp_sock.listen(5)
 
-    print("Server started")
-    print(f"Listening for display messages on {sock_path}")
-    if args.tcp:
-        print(f"Listening for network messages on port {tcp_port}")
+def run_display_loop(stop_event=None):
+    """Show queued messages until stop_event is set (forever if it is None)"""
+    while stop_event is None or not stop_event.is_set():
+        try:
+            check_queue()
+            if window_visible:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        raise SystemExit
+                if message_visible:
+                    update_marquee()
+            time.sleep(0.1)
+        except pygame.error:
+            destroy_window()
+            abandon_current_message()
+            time.sleep(0.1)
 
-    # Start the socket listener thread
-    listener_thread = threading.Thread(target=start_socket_listener)
-    listener_thread.daemon = True
-    listener_thread.start()
 
-    # Start web UI if enabled
-    if args.webui:
-        webui_thread = threading.Thread(target=start_webserver, args=(args.webui_port,))
-        webui_thread.daemon = True
-        webui_thread.start()
+if __name__ == "__main__":
+    args = parse_arguments()
+    render_profiler.enabled = args.profile
+
+    if args.display_client:
+        # Display clients only render, the hub owns ingest, history and the web UI
+        print("\nDisplay Client Configuration:")
+        print(f"Hub: {args.display_client}")
+        print(f"Profiler API: {'Enabled' if args.webui else 'Disabled'} (Port {args.webui_port}, {args.webui_server} server)")
+
+        display_client = DisplayClient(args.display_client)
+        display_client.start()
+
+        # The render loop runs here, so this is where /api/profile has something to report
+        if args.webui:
+            webui_display_client = True
+            webui_thread = threading.Thread(target=start_webserver, args=(args.webui_port, None, args.webui_server))
+            webui_thread.daemon = True
+            webui_thread.start()
+    else:
+        print("\nServer Configuration:")
+        print(f"Unix Socket: Enabled at {sock_path}")
+        print(f"TCP Socket: {'Enabled' if args.tcp else 'Disabled'} (Port {tcp_port})")
+        print(f"Web UI: {'Enabled' if args.webui else 'Disabled'} (Port {args.webui_port}, {args.webui_server} server)")
+        print(f"Hub: {'Enabled at ' + args.hub if args.hub else 'Disabled'}")
+
+        open_ingest_sockets(args.tcp)
+
+        message_scheduler = MessageScheduler(args.schedule_file)
+        message_scheduler.load()
+        message_scheduler.start()
+
+        print("Server started")
+        print(f"Listening for display messages on {sock_path}")
+        if args.tcp:
+            print(f"Listening for network messages on port {tcp_port}")
+
+        # Start the socket listener thread
+        listener_thread = threading.Thread(target=start_socket_listener)
+        listener_thread.daemon = True
+        listener_thread.start()
+
+        # Start web UI if enabled
+        if args.webui:
+            webui_thread = threading.Thread(target=start_webserver, args=(args.webui_port, None, args.webui_server))
+            webui_thread.daemon = True
+            webui_thread.start()
 
     try:
-        while True:
-            try:
-                check_queue()
-                if window_visible:
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            raise SystemExit
-                    if message_visible:
-                        update_marquee()
-                time.sleep(0.1)
-            except pygame.error:
-                destroy_window()
-                time.sleep(0.1)
+        if args.hub and not args.display_client:
+            # The hub does not render, it paces messages across its display clients
+            hub = DisplayHub(args.hub)
+            hub.start()
+            hub.run()
+
+        run_display_loop()
 
     except (KeyboardInterrupt, SystemExit):
         print("\nShutting down server...")
@@ -0,0 +1,98 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+os.environ['MARQUEE_HEADLESS'] = '1'
+
+import marquee_msg_sys as server  # noqa: E402
+
+
+@pytest.fixture
+def new_york():
+    previous = os.environ.get('TZ')
+    os.environ['TZ'] = 'America/New_York'
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ['TZ']
+    else:
+        os.environ['TZ'] = previous
+    time.tzset()
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize('field, low, high, expected', [
+    ('*', 0, 5, {0, 1, 2, 3, 4, 5}),
+    ('*/15', 0, 59, {0, 15, 30, 45}),
+    ('1-5', 0, 59, {1, 2, 3, 4, 5}),
+    ('1-10/3', 0, 59, {1, 4, 7, 10}),
+    ('5/20', 0, 59, {5, 25, 45}),
+    ('1,3,5', 0, 59, {1, 3, 5}),
+    ('7', 0, 7, {7}),
+])
+def test_parse_cron_field(field, low, high, expected):
+    assert server.parse_cron_field(field, low, high) == expected
+
+
+@pytest.mark.parametrize('field', ['60', '5-1', 'a', '*/0', '-1', ''])
+def test_parse_cron_field_rejects_invalid(field):
+    with pytest.raises(ValueError):
+        server.parse_cron_field(field, 0, 59)
+
+
+def test_cron_expression_needs_five_fields():
+    with pytest.raises(ValueError):
+        server.CronExpression('* *')
+
+
+def test_next_after_weekdays(new_york):
+    cron = server.CronExpression('30 9 * * 1-5')
+    saturday_noon = datetime(2026, 10, 17, 12, 0).timestamp()
+    assert datetime.fromtimestamp(cron.next_after(saturday_noon)) == datetime(2026, 10, 19, 9, 30)
+
+
+def test_next_after_is_strictly_later():
+    cron = server.CronExpression('0 * * * *')
+    on_the_hour = datetime(2026, 10, 19, 10, 0).timestamp()
+    assert cron.next_after(on_the_hour) == datetime(2026, 10, 19, 11, 0).timestamp()
+
+
+def test_next_after_day_of_month_or_weekday(new_york):
+    # Like cron, a restricted day-of-month and day-of-week match either
+    cron = server.CronExpression('0 0 13 * 5')
+    result = datetime.fromtimestamp(cron.next_after(datetime(2026, 10, 19).timestamp()))
+    assert result == datetime(2026, 10, 23)
+
+
+def test_next_after_never_matches():
+    with pytest.raises(ValueError):
+        server.CronExpression('0 0 31 2 *').next_after(time.time())
+
+
+def test_next_after_repeated_hour_when_clocks_go_back(new_york):
+    # 06:30 UTC is the second 01:30 in New York on 2026-11-01
+    now = utc(2026, 11, 1, 6, 30)
+    assert server.CronExpression('* * * * *').next_after(now) == now + 60
+    assert server.CronExpression('45 1 * * *').next_after(now) == utc(2026, 11, 1, 6, 45)
+
+
+def test_next_after_skipped_hour_when_clocks_go_forward(new_york):
+    # 06:59 UTC is 01:59 EST, the next minute is 03:00 EDT on 2026-03-08
+    now = utc(2026, 3, 8, 6, 59)
+    assert server.CronExpression('* * * * *').next_after(now) == now + 60
+    assert server.CronExpression('30 2 * * *').next_after(now) > now
+
+
+@pytest.mark.parametrize('start', [utc(2026, 11, 1, 4, 0), utc(2026, 3, 8, 5, 0)])
+def test_next_after_always_advances_across_dst(new_york, start):
+    cron = server.CronExpression('* * * * *')
+    now = start
+    for _ in range(6 * 60):
+        result = cron.next_after(now)
+        assert now < result <= now + 60
+        now = result
@@ -0,0 +1,78 @@
+import os
+import socket
+import time
+
+os.environ['MARQUEE_HEADLESS'] = '1'
+
+import marquee_msg_sys as server  # noqa: E402
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_read_hub_frames_skips_bad_lines():
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(b'[1]\nnot json\n{"type": "done", "id": "a"}\n{"type"')
+        frames, buffer = server.read_hub_frames(right, b"")
+    assert frames == [{'type': 'done', 'id': 'a'}]
+    assert buffer == b'{"type"'
+
+
+def test_message_from_fields_ignores_unknown_fields():
+    msg = server.message_from_fields({
+        'text': 'hi', 'priority': 1, 'blink_mode': 0, 'color': 'red', 'bg_color': 'black',
+        'speed': 0.05, 'wav_path': '', 'use_espeak': '', 'added_in_a_newer_hub': True
+    })
+    assert msg.text == 'hi'
+
+
+def test_hub_survives_bad_frames(tmp_path):
+    address = str(tmp_path / 'hub.sock')
+    hub = server.DisplayHub(address)
+    hub.start()
+
+    attacker = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    attacker.connect(address)
+    attacker.sendall(b'[1]\n"text"\n{"type": "sync"}\n{"type": "done", "id": 5}\n{"type": "sync", "client_time": []}\n')
+
+    received = []
+    client = server.DisplayClient(address, on_message=received.append)
+    client.start()
+    assert wait_for(lambda: client.best_rtt is not None)
+
+    msg = server.Message('hello', 1, 0, 'red', 'black', 0.05, '', '')
+    assert hub.broadcast(msg) is not None
+    assert wait_for(lambda: [m.text for m in received] == ['hello'])
+    attacker.close()
+
+
+def test_client_survives_bad_frames(tmp_path):
+    address = str(tmp_path / 'fake_hub.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(address)
+    listener.listen(1)
+
+    received = []
+    client = server.DisplayClient(address, on_message=received.append)
+    client.start()
+    connection, _ = listener.accept()
+
+    good = {
+        'text': 'hello', 'priority': 1, 'blink_mode': 0, 'color': 'red', 'bg_color': 'black',
+        'speed': 0.05, 'wav_path': '', 'use_espeak': '', 'start_at': time.time(), 'from_the_future': 1
+    }
+    connection.sendall(
+        b'[1]\n{"type": "sync"}\n{"type": "show", "message": "x"}\n'
+        b'{"type": "show", "message": {"text": "missing fields"}}\n'
+        + server.encode_hub_frame({'type': 'show', 'message': good})
+    )
+    assert wait_for(lambda: [m.text for m in received] == ['hello'])
+    connection.close()
+    listener.close()
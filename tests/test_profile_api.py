@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+os.environ['MARQUEE_HEADLESS'] = '1'
+
+import marquee_msg_sys as server  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    server.render_profiler.enabled = False
+    yield server.app.test_client()
+    server.render_profiler.enabled = False
+
+
+@pytest.mark.parametrize('body', ['[1]', '"on"', '5', 'not json'])
+def test_update_profile_rejects_non_object_body(client, body):
+    response = client.post('/api/profile', data=body, content_type='application/json')
+    assert response.status_code == 400
+
+
+def test_update_profile_toggles_profiling(client):
+    response = client.post('/api/profile', json={'enabled': True})
+    assert response.status_code == 200
+    assert client.get('/api/profile').get_json()['enabled'] is True
+
+
+def test_update_profile_accepts_empty_body(client):
+    assert client.post('/api/profile').status_code == 200
+
+
+def test_display_client_only_serves_profiler(client, monkeypatch):
+    monkeypatch.setattr(server, 'webui_display_client', True)
+    assert client.get('/api/profile').status_code == 200
+    assert client.post('/api/profile', json={'clear': True}).status_code == 200
+    assert client.get('/').status_code == 404
+    assert client.post('/api/send-message', json={'text': 'hi'}).status_code == 404